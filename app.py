@@ -5,8 +5,10 @@ Interactive dashboard for viewing and exporting student scores.
 
 import streamlit as st
 import pandas as pd
-import json
+import numpy as np
 import os
+import re
+import hashlib
 from pathlib import Path
 
 # Page configuration
@@ -23,54 +25,147 @@ st.markdown("---")
 
 # File paths
 APP_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
-JSON_FILE = APP_DIR / "data.json"
+PARQUET_FILE = APP_DIR / "data.parquet"
+CACHE_DIR = APP_DIR / ".cache"
 
+# Columns shown and exported (helper columns starting with '_' are internal)
+DATA_COLUMNS = ['Rank', 'Name', 'RollNo', 'Campus', 'OverallPseudocode', 'OverallCoding', 'OverallDailyTest', 'Total']
 
-@st.cache_data
-def load_data_from_json():
-    """Load data from pre-extracted JSON file."""
-    try:
-        with open(JSON_FILE, 'r', encoding='utf-8') as f:
-            records = json.load(f)
-        df = pd.DataFrame(records)
-        df = df[['Rank', 'Name', 'RollNo', 'Campus', 'OverallPseudocode', 'OverallCoding', 'OverallDailyTest', 'Total']]
-        return df
-    except Exception as e:
+
+def content_key(file_content: str) -> str:
+    """Short hash identifying an uploaded report's content."""
+    return hashlib.blake2b(file_content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def add_search_columns(df):
+    """Add lowercase name and roll number columns used by the search box."""
+    df['_name_lc'] = df['Name'].str.lower()
+    df['_roll_str'] = df['RollNo']
+    return df
+
+
+@st.cache_resource(show_spinner=False)
+def load_data_from_parquet():
+    """Load data from the pre-built parquet file (shared across sessions, never mutate it)."""
+    if not PARQUET_FILE.exists():
         return pd.DataFrame()
+    return add_search_columns(pd.read_parquet(PARQUET_FILE))
+
+
+@st.cache_resource(show_spinner=False)
+def get_parser():
+    """Import the HTML parser module on first use - it is only needed for uploaded reports."""
+    import parser
+    return parser
 
 
 @st.cache_data
-def load_data_from_html(file_content: str):
-    """Load data from uploaded HTML file content."""
-    from parser import parse_html_file_content
+def load_data_from_html(_file_content: str, data_key: str):
+    """
+    Load data from uploaded HTML file content, reusing a parsed copy on disk if available.
+    
+    The content itself is not hashed - data_key (see content_key) identifies it instead.
+    """
+    parser = get_parser()
+    cache_file = CACHE_DIR / f"{data_key}.parquet"
+    if cache_file.exists():
+        # Normalize on read so files written by an older parser get the current schema
+        try:
+            return add_search_columns(parser.normalize_dataframe(pd.read_parquet(cache_file)))
+        except Exception:
+            pass
+    
     try:
-        records = parse_html_file_content(file_content)
-        df = pd.DataFrame(records)
-        df = df[['Rank', 'Name', 'RollNo', 'Campus', 'OverallPseudocode', 'OverallCoding', 'OverallDailyTest', 'Total']]
-        return df
+        df = parser.parse_html_file_content(_file_content)
     except Exception as e:
         st.error(f"Error parsing HTML: {e}")
         return pd.DataFrame()
+    
+    # The disk cache is best effort - a read-only deployment just skips it
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        df.to_parquet(cache_file, compression='zstd', index=False)
+    except Exception:
+        pass
+    return add_search_columns(df)
 
 
-# Try to load default data
-df = load_data_from_json()
+@st.cache_data(show_spinner=False)
+def compute_stats(_df, data_key: str) -> dict:
+    """
+    Summary statistics of the full (unfiltered) data.
+    
+    The frame itself is not hashed - data_key identifies the data source instead.
+    """
+    stats = {
+        'count': len(_df),
+        'total_max': float(_df['Total'].max()),
+        'total_mean': float(_df['Total'].mean()),
+    }
+    for column in ['OverallPseudocode', 'OverallCoding', 'OverallDailyTest']:
+        stats[column] = {
+            'mean': float(_df[column].mean()),
+            'median': float(_df[column].median()),
+            'max': float(_df[column].max()),
+            'min': float(_df[column].min()),
+        }
+    return stats
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def all_data_csv(_df, data_key: str) -> bytes:
+    """
+    CSV export of the full data, built once per data source.
+    
+    The frame itself is not hashed - data_key identifies the data source instead.
+    """
+    return _df[DATA_COLUMNS].to_csv(index=False).encode('utf-8')
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def filtered_csv(_filtered_df, data_key: str, selected_campus: str, roll_filter: tuple,
+                 search_term: str, min_total: float, sort_column: str, ascending: bool) -> bytes:
+    """
+    CSV export of the filtered and sorted view.
+    
+    The frame itself is not hashed - the data source and filter settings that
+    produced it identify it instead.
+    """
+    return _filtered_df[DATA_COLUMNS].to_csv(index=False).encode('utf-8')
+
+
+# Load default data once per session and keep the same frame across reruns
+# (shallow copy so the shared cached frame is never modified)
+if 'df' not in st.session_state:
+    st.session_state['df'] = load_data_from_parquet().copy(deep=False)
+    st.session_state['data_key'] = str(PARQUET_FILE)
 
 # If no default data, show upload option
-if df.empty:
+if st.session_state['df'].empty:
     st.info("📁 No default data found. Please upload your TCD Technical HTML report.")
     uploaded_file = st.file_uploader("Upload HTML Report", type=['html', 'htm'])
     
-    if uploaded_file is not None:
-        content = uploaded_file.read().decode('utf-8')
-        df = load_data_from_html(content)
-    else:
+    if uploaded_file is None:
         st.stop()
+    
+    # Only read and parse the upload when a different file is chosen
+    if st.session_state.get('upload_id') != uploaded_file.file_id:
+        content = uploaded_file.read().decode('utf-8')
+        st.session_state['upload_key'] = content_key(content)
+        st.session_state['upload_df'] = load_data_from_html(content, st.session_state['upload_key'])
+        st.session_state['upload_id'] = uploaded_file.file_id
+    df = st.session_state['upload_df']
+    data_key = st.session_state['upload_key']
+else:
+    df = st.session_state['df']
+    data_key = st.session_state['data_key']
 
 if df.empty:
     st.warning("No data loaded. Please check the file format.")
     st.stop()
 
+stats = compute_stats(df, data_key)
+
 # Sidebar - Filters and Options
 st.sidebar.header("🔧 Options")
 
@@ -79,52 +174,22 @@ st.sidebar.subheader("🏫 Campus Filter")
 campuses = ['All Campuses'] + sorted(df['Campus'].unique().tolist())
 selected_campus = st.sidebar.selectbox("Select Campus", campuses)
 
-# Search
-search_term = st.sidebar.text_input("🔍 Search by Name or Roll No", "")
-
 # Custom filter for multiple students
 st.sidebar.subheader("📝 Custom Filter")
 st.sidebar.markdown("Enter Roll Numbers (one per line or comma-separated)")
 custom_filter = st.sidebar.text_area("Roll Numbers", height=100, placeholder="2023003611\n2023001493\nor: 2023003611, 2023001493")
 enable_custom_filter = st.sidebar.checkbox("Apply Custom Filter")
 
-# Sorting options
-st.sidebar.subheader("📈 Sorting")
-sort_column = st.sidebar.selectbox(
-    "Sort by",
-    options=['Rank', 'Name', 'RollNo', 'OverallPseudocode', 'OverallCoding', 'OverallDailyTest', 'Total'],
-    index=0
-)
-sort_order = st.sidebar.radio("Order", ["Ascending", "Descending"], index=0 if sort_column == 'Rank' else 1)
-
-# Score filters
-st.sidebar.subheader("📊 Score Filters")
-min_total = st.sidebar.slider(
-    "Minimum Total Score",
-    min_value=0.0,
-    max_value=float(df['Total'].max()) if not df.empty else 300.0,
-    value=0.0,
-    step=1.0
-)
-
-# Apply filters
-filtered_df = df.copy()
+# Sidebar filters - build one combined NumPy mask, the table view narrows it further
+base_mask = np.ones(len(df), dtype=bool)
+campus_ranks = None
+roll_filter = ()
 
 # Campus filter
 if selected_campus != 'All Campuses':
-    filtered_df = filtered_df[filtered_df['Campus'] == selected_campus]
-    # Recalculate ranks for the selected campus
-    filtered_df = filtered_df.sort_values('Total', ascending=False).reset_index(drop=True)
-    # Handle ties properly with min rank method
-    current_rank = 1
-    prev_total = None
-    ranks = []
-    for i, total in enumerate(filtered_df['Total']):
-        if prev_total is not None and total < prev_total:
-            current_rank = i + 1
-        ranks.append(current_rank)
-        prev_total = total
-    filtered_df['Rank'] = ranks
+    base_mask &= (df['Campus'] == selected_campus).to_numpy(dtype=bool, na_value=False)
+    # Recalculate ranks for the selected campus (ties share the min rank)
+    campus_ranks = df.loc[base_mask, 'Total'].rank(method='min', ascending=False).astype('int32')
 
 # Custom filter (if enabled, override other filters except campus)
 if enable_custom_filter and custom_filter.strip():
@@ -138,41 +203,26 @@ if enable_custom_filter and custom_filter.strip():
         roll_numbers.extend(parts)
     
     if roll_numbers:
-        # Filter to include roll numbers that contain any of the entered values (partial match)
-        mask = filtered_df['RollNo'].astype(str).str.contains('|'.join(roll_numbers), case=False, regex=True, na=False)
-        filtered_df = filtered_df[mask]
+        # Filter to include roll numbers that contain any of the entered values (partial match).
+        # Entered values are escaped so characters like '(' match literally, in a single pass
+        pattern = '|'.join(map(re.escape, roll_numbers))
+        base_mask &= df['_roll_str'].str.contains(pattern, case=False, regex=True, na=False).to_numpy(dtype=bool)
+        roll_filter = tuple(roll_numbers)
         st.sidebar.success(f"✅ Filtering by {len(roll_numbers)} roll number(s)")
-        if filtered_df.empty:
+        if not base_mask.any():
             st.sidebar.error("❌ No matches found")
     else:
         st.sidebar.warning("⚠️ No valid roll numbers entered")
 
-# Search filter
-if search_term:
-    search_term_lower = search_term.lower()
-    filtered_df = filtered_df[
-        filtered_df['Name'].str.lower().str.contains(search_term_lower, na=False) |
-        filtered_df['RollNo'].astype(str).str.contains(search_term, na=False)
-    ]
-
-# Score filter
-filtered_df = filtered_df[filtered_df['Total'] >= min_total]
-
-# Apply sorting
-ascending = sort_order == "Ascending"
-filtered_df = filtered_df.sort_values(by=sort_column, ascending=ascending)
-
 # Main content area
-col1, col2, col3, col4 = st.columns(4)
+col1, col2, col3 = st.columns(3)
 
 with col1:
-    st.metric("📚 Total Students", len(df))
+    st.metric("📚 Total Students", stats['count'])
 with col2:
-    st.metric("🔍 Filtered Results", len(filtered_df))
+    st.metric("🏆 Highest Total", f"{stats['total_max']:.1f}")
 with col3:
-    st.metric("🏆 Highest Total", f"{df['Total'].max():.1f}")
-with col4:
-    st.metric("📈 Average Total", f"{df['Total'].mean():.1f}")
+    st.metric("📈 Average Total", f"{stats['total_mean']:.1f}")
 
 st.markdown("---")
 
@@ -197,96 +247,138 @@ for row in range(num_rows):
 
 st.markdown("---")
 
-# Display the dataframe
-st.subheader(f"📋 Student Scores ({len(filtered_df)} records)")
-
-# Format the dataframe for display
-display_df = filtered_df.copy()
-display_df['OverallPseudocode'] = display_df['OverallPseudocode'].round(1)
-display_df['OverallCoding'] = display_df['OverallCoding'].round(1)
-display_df['OverallDailyTest'] = display_df['OverallDailyTest'].round(1)
-display_df['Total'] = display_df['Total'].round(1)
-
-# Rename columns for better display
-display_df = display_df.rename(columns={
-    'RollNo': 'Roll No',
-    'OverallPseudocode': 'Pseudocode',
-    'OverallCoding': 'Coding',
-    'OverallDailyTest': 'Daily Test'
-})
-
-# Reorder columns to put Campus after Roll No
-column_order = ['Rank', 'Name', 'Roll No', 'Campus', 'Pseudocode', 'Coding', 'Daily Test', 'Total']
-display_df = display_df[column_order]
-
-st.dataframe(
-    display_df,
-    use_container_width=True,
-    hide_index=True,
-    column_config={
-        "Rank": st.column_config.NumberColumn("Rank", format="%d"),
-        "Pseudocode": st.column_config.NumberColumn("Pseudocode", format="%.1f"),
-        "Coding": st.column_config.NumberColumn("Coding", format="%.1f"),
-        "Daily Test": st.column_config.NumberColumn("Daily Test", format="%.1f"),
-        "Total": st.column_config.NumberColumn("Total", format="%.1f"),
-    }
-)
-
-st.markdown("---")
 
-# Export section
-st.subheader("📥 Export Data")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    # Export filtered data
-    csv_filtered = filtered_df.to_csv(index=False)
-    st.download_button(
-        label="⬇️ Download Filtered Data (CSV)",
-        data=csv_filtered,
-        file_name="tcd_scores_filtered.csv",
-        mime="text/csv",
-        help="Download the currently filtered and sorted data"
+@st.fragment
+def filtered_view(df, data_key: str, selected_campus: str, roll_filter: tuple, base_mask, campus_ranks, max_total: float):
+    """
+    Search, sort and score filter controls with the table and exports.
+    
+    Runs as a fragment, so changing these controls reruns only this section.
+    """
+    # Filled in once the filters below are applied
+    filtered_metric = st.empty()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        # Search
+        search_term = st.text_input("🔍 Search by Name or Roll No", "")
+    with col2:
+        # Sorting options
+        sort_column = st.selectbox(
+            "📈 Sort by",
+            options=['Rank', 'Name', 'RollNo', 'OverallPseudocode', 'OverallCoding', 'OverallDailyTest', 'Total'],
+            index=0
+        )
+    with col3:
+        sort_order = st.radio("Order", ["Ascending", "Descending"], index=0 if sort_column == 'Rank' else 1, horizontal=True)
+    with col4:
+        # Score filters
+        min_total = st.slider(
+            "📊 Minimum Total Score",
+            min_value=0.0,
+            max_value=max_total,
+            value=0.0,
+            step=1.0
+        )
+    
+    mask = base_mask.copy()
+    
+    # Search filter
+    if search_term:
+        search_term_lower = search_term.lower()
+        mask &= (
+            df['_name_lc'].str.contains(search_term_lower, na=False, regex=False).to_numpy(dtype=bool) |
+            df['_roll_str'].str.contains(search_term, na=False, regex=False).to_numpy(dtype=bool)
+        )
+    
+    # Score filter - compare on the raw float32 array
+    mask &= df['Total'].to_numpy() >= min_total
+    
+    filtered_df = df.loc[mask]
+    if campus_ranks is not None:
+        # Align to the filtered rows - assigning the full campus Series to an
+        # empty frame would otherwise re-index it to every campus student
+        filtered_df = filtered_df.assign(Rank=campus_ranks.reindex(filtered_df.index))
+    
+    # Apply sorting
+    ascending = sort_order == "Ascending"
+    filtered_df = filtered_df.sort_values(by=sort_column, ascending=ascending)
+    
+    filtered_metric.metric("🔍 Filtered Results", len(filtered_df))
+    
+    # Display the dataframe
+    st.subheader(f"📋 Student Scores ({len(filtered_df)} records)")
+    
+    # Display labels and precision come from column_config, so the filtered
+    # frame is shown as is (helper columns are left out by column_order)
+    st.dataframe(
+        filtered_df,
+        use_container_width=True,
+        hide_index=True,
+        column_order=DATA_COLUMNS,
+        column_config={
+            "Rank": st.column_config.NumberColumn("Rank", format="%d"),
+            "RollNo": st.column_config.TextColumn("Roll No"),
+            "OverallPseudocode": st.column_config.NumberColumn("Pseudocode", format="%.1f"),
+            "OverallCoding": st.column_config.NumberColumn("Coding", format="%.1f"),
+            "OverallDailyTest": st.column_config.NumberColumn("Daily Test", format="%.1f"),
+            "Total": st.column_config.NumberColumn("Total", format="%.1f"),
+        }
     )
+    
+    st.markdown("---")
+    
+    # Export section
+    st.subheader("📥 Export Data")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Export filtered data
+        csv_filtered = filtered_csv(
+            filtered_df, data_key, selected_campus, roll_filter,
+            search_term, min_total, sort_column, ascending
+        )
+        st.download_button(
+            label="⬇️ Download Filtered Data (CSV)",
+            data=csv_filtered,
+            file_name="tcd_scores_filtered.csv",
+            mime="text/csv",
+            help="Download the currently filtered and sorted data"
+        )
+    
+    with col2:
+        # Export all data
+        csv_all = all_data_csv(df, data_key)
+        st.download_button(
+            label="⬇️ Download All Data (CSV)",
+            data=csv_all,
+            file_name="tcd_scores_all.csv",
+            mime="text/csv",
+            help="Download all student data"
+        )
 
-with col2:
-    # Export all data
-    csv_all = df.to_csv(index=False)
-    st.download_button(
-        label="⬇️ Download All Data (CSV)",
-        data=csv_all,
-        file_name="tcd_scores_all.csv",
-        mime="text/csv",
-        help="Download all student data"
-    )
+
+filtered_view(df, data_key, selected_campus, roll_filter, base_mask, campus_ranks, stats['total_max'])
 
 # Statistics section
 st.markdown("---")
 st.subheader("📊 Score Statistics")
 
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.markdown("**Pseudocode Scores**")
-    st.write(f"- Mean: {df['OverallPseudocode'].mean():.1f}")
-    st.write(f"- Median: {df['OverallPseudocode'].median():.1f}")
-    st.write(f"- Max: {df['OverallPseudocode'].max():.1f}")
-    st.write(f"- Min: {df['OverallPseudocode'].min():.1f}")
-
-with col2:
-    st.markdown("**Coding Scores**")
-    st.write(f"- Mean: {df['OverallCoding'].mean():.1f}")
-    st.write(f"- Median: {df['OverallCoding'].median():.1f}")
-    st.write(f"- Max: {df['OverallCoding'].max():.1f}")
-    st.write(f"- Min: {df['OverallCoding'].min():.1f}")
-
-with col3:
-    st.markdown("**Daily Test Scores**")
-    st.write(f"- Mean: {df['OverallDailyTest'].mean():.1f}")
-    st.write(f"- Median: {df['OverallDailyTest'].median():.1f}")
-    st.write(f"- Max: {df['OverallDailyTest'].max():.1f}")
-    st.write(f"- Min: {df['OverallDailyTest'].min():.1f}")
+stat_columns = [
+    ('OverallPseudocode', "**Pseudocode Scores**"),
+    ('OverallCoding', "**Coding Scores**"),
+    ('OverallDailyTest', "**Daily Test Scores**"),
+]
+
+for col, (column, title) in zip(st.columns(3), stat_columns):
+    with col:
+        st.markdown(title)
+        st.write(f"- Mean: {stats[column]['mean']:.1f}")
+        st.write(f"- Median: {stats[column]['median']:.1f}")
+        st.write(f"- Max: {stats[column]['max']:.1f}")
+        st.write(f"- Min: {stats[column]['min']:.1f}")
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,40 @@
+"""
+Data Build Script
+Converts the pre-extracted data.json into data.parquet, which the app loads at startup.
+"""
+
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from parser import normalize_dataframe
+
+
+APP_DIR = Path(__file__).resolve().parent
+JSON_FILE = APP_DIR / "data.json"
+PARQUET_FILE = APP_DIR / "data.parquet"
+
+
+def build_parquet(json_path: Path = JSON_FILE, parquet_path: Path = PARQUET_FILE) -> int:
+    """
+    Convert the JSON student records into a zstd-compressed parquet file.
+    
+    Args:
+        json_path: Path to the JSON file (list of student records)
+        parquet_path: Path of the parquet file to write
+    
+    Returns:
+        Number of records written
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    
+    df = normalize_dataframe(pd.DataFrame(records))
+    df.to_parquet(parquet_path, compression='zstd', index=False)
+    return len(df)
+
+
+if __name__ == "__main__":
+    count = build_parquet()
+    print(f"Wrote {count} student records to {PARQUET_FILE.name}")
@@ -7,6 +7,45 @@ import re
 import json
 from pathlib import Path
 
+import pandas as pd
+
+
+_DECODER = json.JSONDecoder()
+
+# Report variables read by parse_html_file_content
+REPORT_VARS = ('studentCore', 'manualOverall')
+
+# Declaration of any report variable, up to its opening brace
+_VAR_START_RE = re.compile(r'const\s+(' + '|'.join(REPORT_VARS) + r')\s*=\s*(\{)')
+
+# Leading number of a score value, e.g. "97" in "97(Reattempt)"
+_NUM_PREFIX_RE = re.compile(r'^([\d.]+)')
+
+# Placeholders used in the report for a missing score
+_MISSING = frozenset(('-', '', 'NA', 'N/A'))
+
+# manualOverall score keys mapped to output column names
+SCORE_COLUMNS = {
+    'OverallPseudocode': 'OverallPseudocode',
+    'OverallCoding': 'OverallCoding',
+    'OverallDaily': 'OverallDailyTest',
+}
+
+# Output column order
+COLUMNS = ['Rank', 'Name', 'RollNo', 'Campus', 'OverallPseudocode', 'OverallCoding', 'OverallDailyTest', 'Total']
+
+# Output column dtypes (Arrow-backed strings, 32-bit numbers)
+DTYPES = {
+    'Rank': 'int32',
+    'Name': 'string[pyarrow]',
+    'RollNo': 'string[pyarrow]',
+    'Campus': 'string[pyarrow]',
+    'OverallPseudocode': 'float32',
+    'OverallCoding': 'float32',
+    'OverallDailyTest': 'float32',
+    'Total': 'float32',
+}
+
 
 def extract_json_object(content: str, var_name: str) -> dict:
     """
@@ -20,35 +59,44 @@ def extract_json_object(content: str, var_name: str) -> dict:
         Parsed dictionary from the JSON object
     """
     # Pattern to find: const varName = { ... }
-    # We need to handle nested braces properly
     pattern = rf'const\s+{var_name}\s*=\s*(\{{)'
     match = re.search(pattern, content)
     
-    if not match:
-        raise ValueError(f"Could not find variable '{var_name}' in content")
-    
-    start_pos = match.start(1)
-    
-    # Find the matching closing brace
-    brace_count = 0
-    end_pos = start_pos
+    return _decode_object(content, var_name, match.start(1) if match else None)
+
+
+def _find_var_starts(content: str) -> dict[str, int]:
+    """
+    Locate the opening brace of every report variable in a single scan.
     
-    for i, char in enumerate(content[start_pos:], start=start_pos):
-        if char == '{':
-            brace_count += 1
-        elif char == '}':
-            brace_count -= 1
-            if brace_count == 0:
-                end_pos = i + 1
-                break
+    Args:
+        content: The HTML file content as a string
     
-    json_str = content[start_pos:end_pos]
+    Returns:
+        Mapping of variable name to the position of its opening brace
+        (first declaration wins, missing variables are left out)
+    """
+    starts = {}
+    for match in _VAR_START_RE.finditer(content):
+        starts.setdefault(match.group(1), match.start(2))
+        if len(starts) == len(REPORT_VARS):
+            break
+    return starts
+
+
+def _decode_object(content: str, var_name: str, start_pos: int | None) -> dict:
+    """Decode the JSON object starting at start_pos (None if the variable was not found)."""
+    if start_pos is None:
+        raise ValueError(f"Could not find variable '{var_name}' in content")
     
-    # Parse as JSON
+    # raw_decode parses from the opening brace and stops at the matching
+    # closing brace, so nested braces are handled by the JSON decoder itself
     try:
-        return json.loads(json_str)
+        obj, _ = _DECODER.raw_decode(content, start_pos)
     except json.JSONDecodeError as e:
         raise ValueError(f"Failed to parse JSON for '{var_name}': {e}")
+    
+    return obj
 
 
 def clean_score(value) -> float:
@@ -68,12 +116,14 @@ def clean_score(value) -> float:
         return float(value)
     
     if isinstance(value, str):
+        value = value.strip()
+        
         # Handle "-" or empty
-        if value.strip() in ["-", "", "NA", "N/A"]:
+        if value in _MISSING:
             return 0.0
         
         # Handle annotations like "97(Reattempt)" - extract the number
-        numeric_match = re.match(r'^([\d.]+)', value.strip())
+        numeric_match = _NUM_PREFIX_RE.match(value)
         if numeric_match:
             return float(numeric_match.group(1))
         
@@ -82,7 +132,42 @@ def clean_score(value) -> float:
     return 0.0
 
 
-def parse_html_file(file_path: str) -> list[dict]:
+def clean_scores(values: pd.Series) -> pd.Series:
+    """
+    Vectorized clean_score over a whole column of raw score values.
+    
+    Args:
+        values: Series of raw score values (numbers, "-", "97(Reattempt)", missing, ...)
+    
+    Returns:
+        Float Series (0.0 for missing/invalid values)
+    """
+    is_str = values.map(lambda value: isinstance(value, str), na_action='ignore').fillna(False).astype(bool)
+    
+    # Real numbers (and booleans) pass through unchanged, as in clean_score
+    numbers = pd.to_numeric(values.mask(is_str), errors='coerce').astype(float)
+    
+    # Strings keep only their leading number, e.g. "97(Reattempt)" -> 97
+    text = values[is_str].astype(str).str.strip().str.extract(_NUM_PREFIX_RE, expand=False)
+    from_text = pd.to_numeric(text, errors='coerce')
+    
+    return numbers.fillna(from_text).fillna(0.0)
+
+
+def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Put student data into the column order and dtypes the app expects.
+    
+    Args:
+        df: DataFrame with at least the COLUMNS columns
+    
+    Returns:
+        DataFrame with only COLUMNS, cast to DTYPES
+    """
+    return df[COLUMNS].astype(DTYPES)
+
+
+def parse_html_file(file_path: str) -> pd.DataFrame:
     """
     Parse the TCD Technical HTML file and extract student data.
     
@@ -90,7 +175,7 @@ def parse_html_file(file_path: str) -> list[dict]:
         file_path: Path to the HTML file
     
     Returns:
-        List of dictionaries with student data including Name, RollNo, scores, total, rank
+        DataFrame with student data including Rank, Name, RollNo, Campus, scores and Total
     """
     file_path = Path(file_path)
     
@@ -104,7 +189,7 @@ def parse_html_file(file_path: str) -> list[dict]:
     return parse_html_file_content(content)
 
 
-def parse_html_file_content(content: str) -> list[dict]:
+def parse_html_file_content(content: str) -> pd.DataFrame:
     """
     Parse HTML content string and extract student data.
     
@@ -112,52 +197,41 @@ def parse_html_file_content(content: str) -> list[dict]:
         content: The HTML file content as a string
     
     Returns:
-        List of dictionaries with student data including Name, RollNo, scores, total, rank
+        DataFrame with student data including Rank, Name, RollNo, Campus, scores and Total
     """
     # Extract the two JSON objects we need
-    student_core = extract_json_object(content, 'studentCore')
-    manual_overall = extract_json_object(content, 'manualOverall')
-    
-    # Merge data and build records
-    records = []
-    
-    for roll_no, core_data in student_core.items():
-        # Get overall scores if available
-        overall_data = manual_overall.get(roll_no, {})
-        
-        record = {
-            'Name': core_data.get('Name', 'Unknown'),
-            'RollNo': core_data.get('regdNo', roll_no),
-            'Campus': core_data.get('Campus', 'Unknown'),
-            'OverallPseudocode': clean_score(overall_data.get('OverallPseudocode', 0)),
-            'OverallCoding': clean_score(overall_data.get('OverallCoding', 0)),
-            'OverallDailyTest': clean_score(overall_data.get('OverallDaily', 0)),
-        }
-        
-        # Calculate total
-        record['Total'] = (
-            record['OverallPseudocode'] + 
-            record['OverallCoding'] + 
-            record['OverallDailyTest']
-        )
-        
-        records.append(record)
-    
-    # Sort by total descending and assign ranks
-    records.sort(key=lambda x: x['Total'], reverse=True)
+    # (both declarations are located in one pass over the HTML)
+    starts = _find_var_starts(content)
+    student_core = _decode_object(content, 'studentCore', starts.get('studentCore'))
+    manual_overall = _decode_object(content, 'manualOverall', starts.get('manualOverall'))
+    
+    # Core details, one row per roll number
+    core_df = pd.DataFrame.from_dict(student_core, orient='index').reindex(columns=['Name', 'regdNo', 'Campus'])
+    df = pd.DataFrame({
+        'Name': core_df['Name'].fillna('Unknown'),
+        'RollNo': core_df['regdNo'].fillna(core_df.index.to_series()),
+        'Campus': core_df['Campus'].fillna('Unknown'),
+    })
+    
+    # Overall scores aligned to the same roll numbers (missing students score 0)
+    overall_df = (
+        pd.DataFrame.from_dict(manual_overall, orient='index')
+        .reindex(index=core_df.index, columns=list(SCORE_COLUMNS))
+        .rename(columns=SCORE_COLUMNS)
+    )
+    for column in overall_df.columns:
+        df[column] = clean_scores(overall_df[column])
+    
+    # Calculate total
+    df['Total'] = df['OverallPseudocode'] + df['OverallCoding'] + df['OverallDailyTest']
     
     # Assign ranks (handle ties with min method)
     # When there are ties, all get the same rank, and next rank skips
     # E.g., if 3 people tie for rank 1, next person gets rank 4
-    current_rank = 1
-    prev_total = None
-    for i, record in enumerate(records):
-        if prev_total is not None and record['Total'] < prev_total:
-            current_rank = i + 1
-        record['Rank'] = current_rank
-        prev_total = record['Total']
+    df['Rank'] = df['Total'].rank(method='min', ascending=False)
+    df = df.sort_values('Rank', kind='stable').reset_index(drop=True)
     
-    return records
+    return normalize_dataframe(df)
 
 
 if __name__ == "__main__":
@@ -173,7 +247,7 @@ if __name__ == "__main__":
         data = parse_html_file(html_path)
         print(f"Parsed {len(data)} student records")
         print("\nTop 5 students:")
-        for record in data[:5]:
-            print(f"  {record['Rank']}. {record['Name']} ({record['RollNo']}) - Total: {record['Total']}")
+        for record in data.head(5).itertuples(index=False):
+            print(f"  {record.Rank}. {record.Name} ({record.RollNo}) - Total: {record.Total}")
     except Exception as e:
         print(f"Error: {e}")